@@ -1,101 +1,483 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import random
 import socket
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, List
 
-import dns.resolver
+import dns.asyncquery
 import dns.exception
+import dns.flags
 import dns.message
-import dns.query
+import dns.rcode
+import dns.rdataclass
 import dns.rdatatype
 
-from rich.console import Console
-from rich.progress import (
-    Progress,
-    BarColumn,
-    TextColumn,
-    TimeElapsedColumn,
-    TimeRemainingColumn,
-    SpinnerColumn,
-)
-from rich.table import Table
-
-console = Console()
+# rich is imported lazily in main() so --no-ui runs never load it
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
 
 
 def load_wordlist(path: str) -> list[str]:
     p = Path(path)
     if not p.exists() or p.stat().st_size == 0:
         raise FileNotFoundError(f"Wordlist not found or empty: {path}")
-    lines = []
     with p.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            # keep only the left-most label (dnsenum wordlists sometimes include dots)
-            s = s.strip(".")
-            lines.append(s)
-    return lines
+        # strip surrounding dots (dnsenum wordlists sometimes include them); duplicates are
+        # dropped in one pass, keeping wordlist order, so each label costs one lookup only
+        labels = (line.strip().strip(".") for line in f)
+        return list(dict.fromkeys(s for s in labels if s and not s.startswith("#")))
+
+
+# sendmmsg(2) lets one syscall send a whole batch of queries (Linux only)
+SEND_BATCH = 64
+
+
+class _Iovec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _Msghdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_Iovec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
 
+class _Mmsghdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _Msghdr), ("msg_len", ctypes.c_uint)]
 
-def make_resolver(nameserver: str, timeout: float) -> dns.resolver.Resolver:
+
+def _load_libc_func(name: str):
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        return getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+
+
+_sendmmsg = _load_libc_func("sendmmsg")
+
+
+def sendmmsg_batch(sock: socket.socket, datagrams: List[bytes]) -> int:
     """
-    Create a fresh resolver instance (avoid sharing between threads).
+    Send datagrams on a connected, non-blocking UDP socket with a single sendmmsg(2) call.
+    Falls back to one send() per datagram where sendmmsg is not available (e.g. macOS).
+    Returns how many datagrams were sent; fewer than requested means the socket buffer is full.
     """
-    r = dns.resolver.Resolver(configure=False)
-    r.nameservers = [nameserver]
-    r.timeout = timeout
-    r.lifetime = timeout
-    r.search = []  # no search domains
+    if _sendmmsg is None:
+        sent = 0
+        for d in datagrams:
+            try:
+                sock.send(d)
+            except BlockingIOError:
+                break
+            sent += 1
+        return sent
+
+    n = len(datagrams)
+    bufs = [ctypes.create_string_buffer(d, len(d)) for d in datagrams]
+    iov = (_Iovec * n)()
+    msgs = (_Mmsghdr * n)()
+    for i, b in enumerate(bufs):
+        iov[i].iov_base = ctypes.addressof(b)
+        iov[i].iov_len = len(datagrams[i])
+        msgs[i].msg_hdr.msg_iov = ctypes.pointer(iov[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+    r = _sendmmsg(sock.fileno(), msgs, n, 0)
+    if r < 0:
+        err = ctypes.get_errno()
+        if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+            return 0
+        raise OSError(err, os.strerror(err))
     return r
 
 
-def udp_tcp_query(
-    nameserver: str,
+_recvmmsg = _load_libc_func("recvmmsg")
+
+# recvmmsg(2) drains up to RECV_BATCH replies per syscall into preallocated buffers
+RECV_BATCH = 32
+RECV_BUFSIZE = 4096
+
+
+class _RecvRing:
+    """
+    Preallocated receive buffers for recvmmsg(2); falls back to one recv() per
+    datagram where recvmmsg is not available (e.g. macOS).
+    """
+
+    def __init__(self, size: int = RECV_BATCH, bufsize: int = RECV_BUFSIZE):
+        self.size = size
+        self.bufsize = bufsize
+        self._bufs = (ctypes.c_char * bufsize * size)()
+        self._iov = (_Iovec * size)()
+        self._msgs = (_Mmsghdr * size)()
+        for i in range(size):
+            self._iov[i].iov_base = ctypes.addressof(self._bufs[i])
+            self._iov[i].iov_len = bufsize
+            self._msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iov[i])
+            self._msgs[i].msg_hdr.msg_iovlen = 1
+
+    def recv(self, sock: socket.socket) -> List[bytes]:
+        """
+        Read every datagram currently queued on the non-blocking socket, up to self.size.
+        """
+        if _recvmmsg is None:
+            out = []
+            for _ in range(self.size):
+                try:
+                    out.append(sock.recv(self.bufsize))
+                except BlockingIOError:
+                    break
+            return out
+
+        n = _recvmmsg(sock.fileno(), self._msgs, self.size, socket.MSG_DONTWAIT, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+            raise OSError(err, os.strerror(err))
+        return [ctypes.string_at(self._bufs[i], self._msgs[i].msg_len) for i in range(n)]
+
+
+def _is_reply(q: dns.message.Message, resp: dns.message.Message) -> bool:
+    """
+    Does resp answer q? The transaction ID is matched by the caller (q itself is a shared,
+    cached message whose own id is not the one on the wire).
+    A multi-question reply that only echoes some of the questions is accepted so
+    multi_query can notice the server ignored the rest instead of waiting for a timeout.
+    """
+    if not resp.flags & dns.flags.QR:
+        return False
+    if not resp.question:
+        # error replies (FORMERR, REFUSED, ...) may omit the question section
+        return resp.rcode() != dns.rcode.NOERROR
+    if not all(n in q.question for n in resp.question):
+        return False
+    return len(q.question) > 1 or len(resp.question) == len(q.question)
+
+
+class _UdpChannel:
+    """
+    One connected, non-blocking UDP socket with its own send queue (flushed via
+    sendmmsg_batch) and receive ring (drained via _RecvRing). Every datagram read
+    is handed to on_datagram.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, nameserver: str, on_datagram):
+        self._loop = loop
+        self._on_datagram = on_datagram
+        self._ring = _RecvRing()
+        self._sendq: deque = deque()
+        self._flush_scheduled = False
+        self._want_write = False
+        sk = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sk.setblocking(False)
+        sk.connect((nameserver, 53))
+        self._sock: Optional[socket.socket] = sk
+        loop.add_reader(sk.fileno(), self._drain)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._loop.remove_reader(self._sock.fileno())
+            if self._want_write:
+                self._loop.remove_writer(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+        self._sendq.clear()
+
+    def _drain(self) -> None:
+        while self._sock is not None:
+            try:
+                batch = self._ring.recv(self._sock)
+            except OSError:
+                # pending ICMP error (e.g. port unreachable); affected queries time out
+                return
+            for data in batch:
+                self._on_datagram(data)
+            if len(batch) < self._ring.size:
+                return
+
+    def send(self, wire: bytes) -> None:
+        self._sendq.append(wire)
+        if self._want_write:
+            return  # socket buffer full; _on_writable flushes
+        if len(self._sendq) >= SEND_BATCH:
+            self._flush()
+        elif not self._flush_scheduled:
+            # flush on the next loop iteration, batching every query queued until then
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        resent = False
+        while self._sendq and self._sock is not None and not self._want_write:
+            batch = [self._sendq.popleft() for _ in range(min(SEND_BATCH, len(self._sendq)))]
+            try:
+                sent = sendmmsg_batch(self._sock, batch)
+            except OSError:
+                if not resent:
+                    # a pending ICMP error consumed the call and is now cleared: send the batch again
+                    resent = True
+                    self._sendq.extendleft(reversed(batch))
+                # persistent error: drop the batch; these queries time out and get retried
+                continue
+            if sent < len(batch):
+                # socket buffer full: requeue the rest and wait until writable
+                self._sendq.extendleft(reversed(batch[sent:]))
+                self._want_write = True
+                self._loop.add_writer(self._sock.fileno(), self._on_writable)
+
+    def _on_writable(self) -> None:
+        self._loop.remove_writer(self._sock.fileno())
+        self._want_write = False
+        self._flush()
+
+
+# queries are spread over this many UDP sockets (each on its own source port)
+UDP_CHANNELS = min(os.cpu_count() or 1, 4)
+
+
+class AsyncDnsResolver:
+    """
+    A few UDP sockets (see _UdpChannel) shared by every query; replies are matched to
+    the waiting query by DNS transaction ID, so hundreds of queries can be in flight at once.
+    Transaction IDs are unique across all sockets and pick the socket a query goes out on.
+    """
+
+    def __init__(self, nameserver: str, max_inflight: int, channels: int = UDP_CHANNELS):
+        self.nameserver = nameserver
+        self.pending: Dict[int, Tuple[dns.message.Message, asyncio.Future]] = {}
+        self._slots = asyncio.Semaphore(max(1, max_inflight))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._nchannels = max(1, channels)
+        self._channels: List[_UdpChannel] = []
+        # whether the server answers multi-question packets (None = not known yet)
+        self.multi_question: Optional[bool] = None
+
+    async def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._channels = [
+            _UdpChannel(self._loop, self.nameserver, self.datagram_received) for _ in range(self._nchannels)
+        ]
+
+    def close(self) -> None:
+        for ch in self._channels:
+            ch.close()
+        self._channels = []
+        for _, fut in self.pending.values():
+            if not fut.done():
+                fut.cancel()
+        self.pending.clear()
+
+    def datagram_received(self, data: bytes) -> None:
+        if len(data) < 2:
+            return
+        entry = self.pending.get(int.from_bytes(data[:2], "big"))
+        if entry is None:
+            return  # late reply to a query that already timed out
+        q, fut = entry
+        if fut.done():
+            return
+        try:
+            resp = dns.message.from_wire(data)
+        except Exception as e:
+            fut.set_exception(e)
+            return
+        if _is_reply(q, resp):
+            fut.set_result(resp)
+
+    def _new_id(self) -> int:
+        while True:
+            qid = random.getrandbits(16)
+            if qid not in self.pending:
+                return qid
+
+    async def udp(self, q: dns.message.Message, wire: bytes, timeout: float) -> dns.message.Message:
+        """
+        Send the prebuilt wire form of q under a fresh transaction ID; q is not modified.
+        """
+        async with self._slots:
+            qid = self._new_id()
+            fut = self._loop.create_future()
+            self.pending[qid] = (q, fut)
+            try:
+                self._channels[qid % len(self._channels)].send(qid.to_bytes(2, "big") + wire[2:])
+                return await asyncio.wait_for(fut, timeout)
+            except asyncio.TimeoutError:
+                raise dns.exception.Timeout(timeout=timeout)
+            finally:
+                self.pending.pop(qid, None)
+
+    async def tcp(self, q: dns.message.Message, timeout: float) -> dns.message.Message:
+        async with self._slots:
+            return await dns.asyncquery.tcp(q, self.nameserver, timeout=timeout)
+
+
+@lru_cache(maxsize=32)
+def _rdtype(rtype: str) -> dns.rdatatype.RdataType:
+    return dns.rdatatype.from_text(rtype)
+
+
+@lru_cache(maxsize=4096)
+def prepare_query(fqdn: str, rdtypes: Tuple[str, ...]) -> Tuple[dns.message.Message, bytes]:
+    """
+    Build the query for fqdn (one question per type) and its wire form once; retries and
+    CNAME hops reuse it and only the 2-byte transaction ID is rewritten per send.
+    The message is shared between callers: treat it as read-only.
+    """
+    q = dns.message.make_query(fqdn, _rdtype(rdtypes[0]))
+    name = q.question[0].name
+    for t in rdtypes[1:]:
+        q.find_rrset(q.question, name, dns.rdataclass.IN, _rdtype(t), create=True, force_unique=True)
+    return q, q.to_wire()
+
+
+async def exchange(
+    resolver: AsyncDnsResolver,
+    q: dns.message.Message,
+    wire: bytes,
+    timeout: float,
+    use_tcp_fallback: bool = True,
+    over_tcp: bool = False,
+) -> dns.message.Message:
+    """
+    Send q over UDP; re-ask over TCP only if the reply is truncated (TC bit) and
+    use_tcp_fallback is set. over_tcp skips UDP (last resort once UDP retries are used up).
+    Timeouts are raised, not swallowed, so resolve_host's retry loop handles them.
+    """
+    if over_tcp:
+        return await resolver.tcp(q, timeout)
+    resp = await resolver.udp(q, wire, timeout)
+    if use_tcp_fallback and resp.flags & dns.flags.TC:
+        resp = await resolver.tcp(q, timeout)
+    return resp
+
+
+async def udp_tcp_query(
+    resolver: AsyncDnsResolver,
     fqdn: str,
     rdtype: str,
     timeout: float,
     use_tcp_fallback: bool = True,
+    over_tcp: bool = False,
 ) -> List[str]:
     """
-    Raw query (UDP first, optional TCP fallback) to reduce false negatives on throttled servers.
+    Raw query (UDP first, TCP on truncation, see exchange).
     Returns list of answer strings.
     """
-    q = dns.message.make_query(fqdn, rdtype)
-    # UDP
-    try:
-        resp = dns.query.udp(q, nameserver, timeout=timeout)
-        if resp.answer:
-            out = []
-            for rrset in resp.answer:
-                if rrset.rdtype == dns.rdatatype.from_text(rdtype):
-                    out.extend([r.to_text() for r in rrset])
-            return out
-        return []
-    except Exception:
-        if not use_tcp_fallback:
-            return []
-    # TCP fallback
+    _rt = _rdtype(rdtype)
+    q, wire = prepare_query(fqdn, (rdtype,))
+    resp = await exchange(resolver, q, wire, timeout, use_tcp_fallback, over_tcp)
+    out = []
+    for rrset in resp.answer:
+        if rrset.rdtype == _rt:
+            out.extend([r.to_text() for r in rrset])
+    return out
+
+
+async def multi_query(
+    resolver: AsyncDnsResolver,
+    fqdn: str,
+    rdtypes: List[str],
+    timeout: float,
+    use_tcp_fallback: bool = True,
+    over_tcp: bool = False,
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Ask for several record types of one name in a single multi-question (QDCOUNT>1) packet.
+    Returns {type: [answer strings]}, or None if the server does not handle multi-question
+    queries (caller should fall back to one udp_tcp_query per type).
+    """
+    q, wire = prepare_query(fqdn, tuple(rdtypes))
+    # decided when the probe is sent: by the time it times out, other probes may have set the flag
+    probing = resolver.multi_question is None
     try:
-        resp = dns.query.tcp(q, nameserver, timeout=timeout)
-        if resp.answer:
-            out = []
-            for rrset in resp.answer:
-                if rrset.rdtype == dns.rdatatype.from_text(rdtype):
-                    out.extend([r.to_text() for r in rrset])
-            return out
-        return []
-    except Exception:
-        return []
+        resp = await exchange(resolver, q, wire, timeout, use_tcp_fallback, over_tcp)
+    except dns.exception.Timeout:
+        # a server that silently drops multi-question packets looks like this too
+        if probing:
+            if resolver.multi_question is None:
+                resolver.multi_question = False
+            return None
+        raise
+
+    # the capability flag is decided once (first conclusive reply) and never flipped afterwards
+    rcode = resp.rcode()
+    if rcode in (dns.rcode.FORMERR, dns.rcode.NOTIMP):
+        if resolver.multi_question is None:
+            resolver.multi_question = False
+        return None
+    if rcode not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+        # SERVFAIL / REFUSED say something about this name, not about multi-question support;
+        # fall back to single-question queries for this host only
+        return None
+    if len(resp.question) != len(q.question):
+        # only the first question answered
+        if resolver.multi_question is None:
+            resolver.multi_question = False
+        return None
+    if resolver.multi_question is None:
+        resolver.multi_question = True
+
+    by_type = {_rdtype(t): t for t in rdtypes}
+    out: Dict[str, List[str]] = {t: [] for t in rdtypes}
+    for rrset in resp.answer:
+        t = by_type.get(rrset.rdtype)
+        if t is not None:
+            out[t].extend([r.to_text() for r in rrset])
+    return out
+
+
+# >99% of real CNAME chains are at most 6 deep
+MAX_CNAME_CHAIN = 6
+
+
+async def chase_hop(
+    resolver: AsyncDnsResolver,
+    target: str,
+    timeout: float,
+    tcp_fallback: bool,
+    over_tcp: bool = False,
+) -> Tuple[List[str], List[str]]:
+    """
+    One step of a CNAME chase: returns (A answers, CNAME answers) for target,
+    asking for both in one packet when the server supports multi-question queries.
+    """
+    answers = None
+    if resolver.multi_question is not False:
+        answers = await multi_query(resolver, target, ["A", "CNAME"], timeout, tcp_fallback, over_tcp)
+    if answers is not None:
+        return answers["A"], answers["CNAME"]
+    a = await udp_tcp_query(resolver, target, "A", timeout, tcp_fallback, over_tcp)
+    if a:
+        return a, []
+    return [], await udp_tcp_query(resolver, target, "CNAME", timeout, tcp_fallback, over_tcp)
+
 
+# retry backoff grows by this many seconds per attempt
+BACKOFF_STEP = 0.15
 
-def resolve_host(
-    nameserver: str,
+
+async def resolve_host(
+    resolver: AsyncDnsResolver,
     fqdn: str,
     timeout: float,
     retries: int,
@@ -105,51 +487,191 @@ def resolve_host(
     """
     Try to resolve fqdn for given record types (default A).
     Adds retry + backoff + UDP/TCP fallback + CNAME handling.
+    UDP is retried with backoff; with tcp_fallback one last attempt goes over TCP.
     Returns (fqdn, "TYPE:value | TYPE:value ...") or None if not found.
     """
     fqdn_abs = fqdn.rstrip(".") + "."
-    results = []
+    results: List[Tuple[str, str]] = []
+
+    # all types (plus CNAME for the A fallback below) go out in one packet when the server allows it
+    has_a = "A" in record_types
+    got_a = False
+    query_types = list(record_types)
+    if has_a and "CNAME" not in query_types:
+        query_types.append("CNAME")
 
     # simple retry with small backoff; helps a LOT on lab DNS
-    for attempt in range(retries + 1):
+    attempts = retries + 1 + (1 if tcp_fallback else 0)
+    for attempt in range(attempts):
+        over_tcp = attempt > retries
         try:
+            answers = None
+            if len(query_types) > 1 and resolver.multi_question is not False:
+                answers = await multi_query(resolver, fqdn_abs, query_types, timeout, tcp_fallback, over_tcp)
+            if answers is None:
+                answers = {}
+                for rtype in record_types:
+                    answers[rtype] = await udp_tcp_query(resolver, fqdn_abs, rtype, timeout, tcp_fallback, over_tcp)
+
             for rtype in record_types:
-                ans = udp_tcp_query(nameserver, fqdn_abs, rtype, timeout, use_tcp_fallback=tcp_fallback)
-                for v in ans:
-                    results.append(f"{rtype}:{v}")
-
-            # If no A but has CNAME, try resolve target A (common pattern)
-            if ("A" in record_types) and not any(x.startswith("A:") for x in results):
-                cnames = udp_tcp_query(nameserver, fqdn_abs, "CNAME", timeout, use_tcp_fallback=tcp_fallback)
-                for c in cnames:
-                    results.append(f"CNAME:{c}")
-                    # resolve A for cname target
-                    a2 = udp_tcp_query(nameserver, c.rstrip(".") + ".", "A", timeout, use_tcp_fallback=tcp_fallback)
-                    for v in a2:
-                        results.append(f"A:{v}")
+                for v in answers[rtype]:
+                    results.append((rtype, v))
+            if has_a and answers["A"]:
+                got_a = True
+
+            # If no A but has CNAME, follow the chain to an A record (common pattern)
+            if has_a and not got_a:
+                if "CNAME" in answers:
+                    cnames = answers["CNAME"]
+                else:
+                    cnames = await udp_tcp_query(resolver, fqdn_abs, "CNAME", timeout, tcp_fallback, over_tcp)
+                seen = {fqdn_abs.lower()}
+                for _ in range(MAX_CNAME_CHAIN):
+                    if not cnames:
+                        break
+                    for c in cnames:
+                        results.append(("CNAME", c))
+                    target = cnames[0].rstrip(".") + "."
+                    if target.lower() in seen:
+                        break  # CNAME loop
+                    seen.add(target.lower())
+                    a2, cnames = await chase_hop(resolver, target, timeout, tcp_fallback, over_tcp)
+                    if a2:
+                        for v in a2:
+                            results.append(("A", v))
+                        got_a = True
+                        break
 
             if results:
-                # de-dup but keep order
-                seen = set()
-                dedup = []
-                for x in results:
-                    if x not in seen:
-                        seen.add(x)
-                        dedup.append(x)
-                return fqdn.rstrip("."), " | ".join(dedup)
+                # de-dup but keep order; (type, value) pairs are only formatted here
+                dedup = list(dict.fromkeys(results))
+                return fqdn.rstrip("."), " | ".join(f"{t}:{v}" for t, v in dedup)
 
             return fqdn.rstrip("."), None
 
         except Exception:
             # backoff and retry
-            if attempt < retries:
-                time.sleep(0.15 * (attempt + 1))
+            if attempt < attempts - 1:
+                await asyncio.sleep(BACKOFF_STEP * (attempt + 1))
                 continue
             return fqdn.rstrip("."), None
 
     return fqdn.rstrip("."), None
 
 
+async def scan(
+    args: argparse.Namespace,
+    words: List[str],
+    record_types: List[str],
+    progress: Optional["Progress"],
+    task_id,
+    hits: List[Tuple[str, str]],
+) -> None:
+    """
+    Resolve every word through one AsyncDnsResolver and report hits as they complete.
+    Without a progress bar (--no-ui) hits go to stdout as "fqdn<TAB>records" lines
+    and progress to stderr.
+    """
+    total = len(words)
+    suffix = args.suffix
+    done = 0
+    last_t = time.time()
+    last_done = 0
+
+    # --threads now caps concurrency: up to 10 in-flight UDP queries per "thread"
+    max_inflight = args.threads * 10
+    # only this many hosts are scheduled at once, so huge wordlists don't sit in memory as tasks
+    window = 2 * max_inflight
+    resolver = AsyncDnsResolver(args.dns, max_inflight=max_inflight)
+    await resolver.open()
+    # opened once; line buffering still gets every hit to disk as it is found
+    out_fp = open(args.out, "a", encoding="utf-8", buffering=1) if args.out else None
+    try:
+        words_iter = iter(words)
+        inflight = set()
+        # load_wordlist already strips dots off each word, so only the domain needs it
+        dom = args.domain.strip(".")
+        dom_suffix = "." + dom if dom else ""
+
+        # hits are printed in batches (every 64, on each progress refresh, and at the end)
+        # so the Live display lock isn't taken once per hit
+        pending_prints: List[Tuple[str, str]] = []
+
+        def flush_prints() -> None:
+            if not pending_prints:
+                return
+            if progress is not None:
+                progress.console.print("\n".join(f"[green][+][/green] {f} -> {r}" for f, r in pending_prints))
+            else:
+                sys.stdout.write("".join(f"{f}\t{r}\n" for f, r in pending_prints))
+                sys.stdout.flush()
+            pending_prints.clear()
+
+        def submit(count: int) -> None:
+            for w in islice(words_iter, count):
+                fqdn = w + dom_suffix
+                inflight.add(asyncio.ensure_future(resolve_host(
+                    resolver,
+                    fqdn,
+                    args.timeout,
+                    args.retries,
+                    args.tcp_fallback,
+                    record_types
+                )))
+
+        submit(window)
+        while inflight:
+            finished, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+            submit(len(finished))
+            for fut in finished:
+                fqdn, recs = fut.result()
+                done += 1
+
+                # refresh the bar at most every 0.5s (and at the end) instead of per host
+                now = time.time()
+                if now - last_t >= 0.5 or done == total:
+                    interval = now - last_t
+                    interval_done = done - last_done
+                    rps = (interval_done / interval) if interval > 0 else 0.0
+                    if progress is not None:
+                        progress.update(task_id, completed=done, rps=f"{rps:.1f}")
+                    else:
+                        print(f"{done}/{total}  {rps:.1f} q/s", file=sys.stderr)
+                    last_t = now
+                    last_done = done
+                    flush_prints()
+
+                if not recs:
+                    continue
+
+                # Suffix filter applies to A records only; parts are "TYPE:value" joined by " | "
+                # and A values carry no whitespace, so a plain endswith is enough
+                matched = True
+                if suffix:
+                    matched = "A:" in recs and any(part.startswith("A:") and part.endswith(suffix)
+                                                   for part in recs.split(" | "))
+
+                if args.show_all or matched:
+                    hits.append((fqdn, recs))
+                    pending_prints.append((fqdn, recs))
+                    if len(pending_prints) >= 64:
+                        flush_prints()
+                    if out_fp:
+                        out_fp.write(f"{fqdn}\t{recs}\n")
+        flush_prints()
+    finally:
+        if out_fp:
+            out_fp.close()
+        resolver.close()
+
+
+def print_error(console: Optional["Console"], msg: str) -> None:
+    if console is not None:
+        console.print(f"[red]{msg}[/red]")
+    else:
+        print(msg, file=sys.stderr)
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Fast DNS brute-force enumerator with realtime output + progress UI (dnsenum-like reliability)."
@@ -157,26 +679,36 @@ def main():
     ap.add_argument("--dns", required=True, help="DNS server IP (authoritative), e.g. 10.129.22.65")
     ap.add_argument("--domain", required=True, help="Target domain, e.g. dev.inlanefreight.htb")
     ap.add_argument("--wordlist", required=True, help="Path to wordlist (one label per line)")
-    ap.add_argument("--threads", type=int, default=60, help="Concurrency (default: 60) - too high can cause misses")
+    ap.add_argument("--threads", type=int, default=60,
+                    help="Concurrency factor (default: 60): up to threads*10 UDP queries in flight and "
+                         "threads*20 hosts scheduled at once. Too high can cause misses - lower it "
+                         "(e.g. 5-10) for throttled lab DNS servers")
     ap.add_argument("--timeout", type=float, default=2.0, help="Timeout per query seconds (default: 2.0)")
     ap.add_argument("--retries", type=int, default=2, help="Retry count on timeouts/throttle (default: 2)")
-    ap.add_argument("--tcp-fallback", action="store_true", help="Fallback to TCP if UDP fails (recommended)")
+    ap.add_argument("--tcp-fallback", action="store_true", help="Retry over TCP on truncated replies and once UDP retries are used up (recommended)")
     ap.add_argument("--suffix", default="", help="Only show IPs ending with this suffix, e.g. .203")
     ap.add_argument("--out", default="", help="Save hits to file (optional)")
     ap.add_argument("--show-all", action="store_true", help="Print all resolved hosts (not just filtered)")
     ap.add_argument("--types", default="A", help="Record types to query, comma-separated. Default: A. Example: A,NS,MX")
+    ap.add_argument("--no-ui", action="store_true",
+                    help="Plain output for scripts: hits on stdout (fqdn<TAB>records), progress on stderr; rich not loaded")
     args = ap.parse_args()
 
+    console = None
+    if not args.no_ui:
+        from rich.console import Console
+        console = Console()
+
     try:
         socket.inet_aton(args.dns)
     except OSError:
-        console.print(f"[red]Invalid DNS server IP:[/red] {args.dns}")
+        print_error(console, f"Invalid DNS server IP: {args.dns}")
         sys.exit(1)
 
     try:
         words = load_wordlist(args.wordlist)
     except Exception as e:
-        console.print(f"[red]{e}[/red]")
+        print_error(console, str(e))
         sys.exit(1)
 
     record_types = [t.strip().upper() for t in args.types.split(",") if t.strip()]
@@ -189,8 +721,25 @@ def main():
     if args.out:
         Path(args.out).write_text("", encoding="utf-8")
 
+    if console is None:
+        start = time.time()
+        asyncio.run(scan(args, words, record_types, None, None, hits))
+        elapsed = time.time() - start
+        print(f"Resolved hosts: {len(hits)}  Elapsed: {elapsed:.1f}s  DNS: {args.dns}", file=sys.stderr)
+        return
+
+    from rich.progress import (
+        Progress,
+        BarColumn,
+        TextColumn,
+        TimeElapsedColumn,
+        TimeRemainingColumn,
+        SpinnerColumn,
+    )
+    from rich.table import Table
+
     console.print(
-        f"[bold]DNS Enum UI[/bold]  dns={args.dns}  domain={args.domain}  words={total}  threads={args.threads}  timeout={args.timeout}s  retries={args.retries}"
+        f"[bold]DNS Enum UI[/bold]  dns={args.dns}  domain={args.domain}  words={total}  threads={args.threads} (max {args.threads * 10} queries in flight)  timeout={args.timeout}s  retries={args.retries}"
     )
     console.print(f"Types: {', '.join(record_types)}  | TCP fallback: {'ON' if args.tcp_fallback else 'OFF'}")
     if args.suffix:
@@ -211,57 +760,10 @@ def main():
     )
 
     start = time.time()
-    done = 0
-    last_t = start
-    last_done = 0
 
     with progress:
         task_id = progress.add_task("dns", total=total, rps="0.0")
-
-        with ThreadPoolExecutor(max_workers=args.threads) as ex:
-            futures = {}
-            for w in words:
-                fqdn = f"{w}.{args.domain}".strip(".")
-                futures[ex.submit(
-                    resolve_host,
-                    args.dns,
-                    fqdn,
-                    args.timeout,
-                    args.retries,
-                    args.tcp_fallback,
-                    record_types
-                )] = fqdn
-
-            for fut in as_completed(futures):
-                fqdn, recs = fut.result()
-                done += 1
-
-                now = time.time()
-                if now - last_t >= 0.5 or done == total:
-                    interval = now - last_t
-                    interval_done = done - last_done
-                    rps = (interval_done / interval) if interval > 0 else 0.0
-                    progress.update(task_id, completed=done, rps=f"{rps:.1f}")
-                    last_t = now
-                    last_done = done
-                else:
-                    progress.update(task_id, completed=done)
-
-                if not recs:
-                    continue
-
-                # Suffix filter applies to A records only
-                matched = True
-                if args.suffix:
-                    matched = any(part.startswith("A:") and part.split("A:", 1)[1].strip().endswith(args.suffix)
-                                  for part in recs.split("|"))
-
-                if args.show_all or matched:
-                    hits.append((fqdn, recs))
-                    progress.console.print(f"[green][+][/green] {fqdn} -> {recs}")
-                    if args.out:
-                        with open(args.out, "a", encoding="utf-8") as f:
-                            f.write(f"{fqdn}\t{recs}\n")
+        asyncio.run(scan(args, words, record_types, progress, task_id, hits))
 
     elapsed = time.time() - start
     table = Table(title="Summary")